@@ -1,6 +1,8 @@
 import datetime
 from collections import defaultdict
 from enum import Enum, auto
+from types import MappingProxyType
+from typing import Mapping
 
 from beaverhabits.logger import logger
 from beaverhabits.storage.storage import EVERY_DAY, Habit, HabitFrequency
@@ -85,3 +87,18 @@ def get_habit_date_completion(
         for day, status in completion.items():
             result[day].append(status)
     return result
+
+
+def get_cached_habit_date_completion(
+    habit: Habit, start: datetime.date, end: datetime.date
+) -> Mapping[datetime.date, tuple[CStatus, ...]]:
+    # Reuse the result until the habit is ticked or its period changes
+    p = habit.period
+    key = (p.to_str() if p else None, start, end)
+    cache = habit.completion_cache
+    if (result := cache.get(key)) is None:
+        completion = get_habit_date_completion(habit, start, end)
+        # Shared between callers, so hand out a read-only copy
+        result = MappingProxyType({day: tuple(x) for day, x in completion.items()})
+        cache[key] = result
+    return result
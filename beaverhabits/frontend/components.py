@@ -1,11 +1,13 @@
-import asyncio
 import calendar
 import datetime
-import os
-from collections import OrderedDict
+import functools
+import io
+from collections import Counter, OrderedDict
 from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Callable, Optional, Self
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional, Self
 
 from dateutil.relativedelta import relativedelta
 from nicegui import app, events, ui
@@ -16,13 +18,21 @@ from beaverhabits import utils
 from beaverhabits.accessibility import index_badge_alternative_text
 from beaverhabits.configs import TagSelectionMode, settings
 from beaverhabits.core.backup import backup_to_telegram
-from beaverhabits.core.completions import CStatus, get_habit_date_completion
+from beaverhabits.core.completions import (
+    CStatus,
+    get_cached_habit_date_completion,
+)
 from beaverhabits.frontend import icons
-from beaverhabits.frontend.javascript import force_checkbox_blur
+from beaverhabits.frontend.javascript import (
+    HEATMAP_DAY_EVENT,
+    HEATMAP_KEY_EVENT,
+    HEATMAP_LONG_PRESS_EVENT,
+    force_checkbox_blur,
+)
 from beaverhabits.frontend.textarea import Textarea
 from beaverhabits.logger import logger
 from beaverhabits.plan import plan
-from beaverhabits.storage.dict import DAY_MASK, MONTH_MASK
+from beaverhabits.storage.dict import MONTH_MASK
 from beaverhabits.storage.meta import get_root_path
 from beaverhabits.storage.storage import (
     EVERY_DAY,
@@ -36,30 +46,38 @@ from beaverhabits.storage.storage import (
 )
 from beaverhabits.utils import (
     PERIOD_TYPE,
-    PERIOD_TYPES,
     PERIOD_TYPES_FOR_HUMAN,
+    PERIOD_TYPES_SET,
     WEEK_DAYS,
     D,
     M,
+    TokenBucket,
     W,
     Y,
     get_user_dark_mode,
-    ratelimiter,
 )
 
-strptime = datetime.datetime.strptime
-
-CALENDAR_EVENT_MASK = "%Y/%m/%d"
+# DAY_MASK is ISO 8601, much cheaper to parse than with strptime
+parse_day = datetime.date.fromisoformat
 
 PRESS_DELAY = 150
 
+# Seconds to wait for more toggles/keystrokes before writing a tick
+TICK_DEBOUNCE_DELAY = 0.2
+NOTE_DEBOUNCE_DELAY = 0.3
+
+
+def page_url(x: str) -> str:
+    # Absolute targets are kept as is, relative ones live under the root path
+    return x if x.startswith("/") else f"{get_root_path()}/{x}"
+
 
 def redirect(x):
-    ui.navigate.to(os.path.join(get_root_path(), x))
+    ui.navigate.to(page_url(x))
 
 
 def open_tab(x):
-    ui.navigate.to(os.path.join(get_root_path(), x), new_tab=True)
+    ui.navigate.to(page_url(x), new_tab=True)
 
 
 def link(text: str, target: str, color: str = "text-white") -> ui.link:
@@ -143,19 +161,22 @@ def habit_tick_dialog(record: CheckedRecord | None, label="Note"):
     return dialog, t
 
 
+def tick_key(kind: str, habit: Habit, day: datetime.date) -> tuple:
+    # Debounce waiters are process-wide, but habit ids are only unique per list
+    return kind, id(habit.habit_list), habit.id, day
+
+
 async def note_tick(habit: Habit, day: datetime.date) -> bool | None:
-    start = min(habit.ticked_days, default=day)
+    start = habit.earliest_ticked_day or day
     dialog_label = utils.format_date_difference(start, day)
 
     record = habit.record_by(day)
     dialog, t = habit_tick_dialog(record, label=dialog_label)
 
-    # Realtime saving
+    # Realtime saving, once typing pauses
     async def t_value_change(e: events.ValueChangeEventArguments):
-        if record:
-
-            if abs(len(e.value) - len(record.text)) < 24:
-                return
+        if not await utils.debounce(tick_key("note", habit, day), NOTE_DEBOUNCE_DELAY):
+            return
         await habit.tick(day, record.done if record else False, e.value)
 
     t.on_value_change(t_value_change)
@@ -170,23 +191,34 @@ async def note_tick(habit: Habit, day: datetime.date) -> bool | None:
         return
 
     yes, text = result
+    # Drop any pending realtime note saving in favor of the final note
+    await utils.debounce(tick_key("note", habit, day), 0)
     record = await habit.tick(day, yes, text)
     logger.info(f"Habit ticked: {day} {yes}, note: {text}")
 
     return record.done
 
 
-@ratelimiter(limit=30, window=30)
-@ratelimiter(limit=10, window=1)
-async def habit_tick(habit: Habit, day: datetime.date, value: bool):
+@TokenBucket([(30, 30), (10, 1)])
+async def write_tick(habit: Habit, day: datetime.date, value: bool) -> None:
+    # Transaction start
+    await habit.tick(day, value)
+    logger.info(f"Day {day} ticked: {value}")
+
+
+async def habit_tick(habit: Habit, day: datetime.date, value: bool) -> bool:
+    # Collapse rapid toggles of the same day into one write of the last value
+    if not await utils.debounce(tick_key("tick", habit, day), TICK_DEBOUNCE_DELAY):
+        return False
+
     # Avoid duplicate tick
     record = habit.record_by(day)
     if record and record.done == value:
-        return
+        return False
 
-    # Transaction start
-    await habit.tick(day, value)
-    logger.info(f"Day {day} ticked: {value}")
+    # Only actual writes count against the rate limit
+    await write_tick(habit, day, value)
+    return True
 
 
 class HabitCheckBox(ui.checkbox):
@@ -207,28 +239,12 @@ class HabitCheckBox(ui.checkbox):
         super().__init__("", value=value)
         self._update_style(value)
 
-        # Hold on event flag
-        self.hold = asyncio.Event()
-        self.moving = False
-
         # Click Event
         self.on("click", self._click_event)
 
-        # Touch and hold event
-        # Sequence of events: https://ui.toast.com/posts/en_20220106
-        # 1. Mouse click: mousedown -> mouseup -> click
-        # 2. Touch click: touchstart -> touchend -> mousemove -> mousedown -> mouseup -> click
-        # 3. Touch move:  touchstart -> touchmove -> touchend
-        self.on("mousedown", self._mouse_down_event)
-        self.on("touchstart.passive", self._mouse_down_event)
-
-        # Event modifiers
-        # 1. *Prevent* checkbox default behavior
-        # 2. *Prevent* propagation of the event
-        self.on("mouseup", self._mouse_up_event)
-        self.on("touchend", self._mouse_up_event)
-        self.on("touchmove.passive", self._mouse_move_event, throttle=1)
-        # self.on("mousemove", self._mouse_move_event)
+        # Touch and hold event, timed by the browser
+        self.props(f'data-long-press-delay="{PRESS_DELAY}"')
+        self.on("long-press.prevent", self._async_long_press)
 
         # Checklist: value change, scrolling
         # - Desktop browser
@@ -247,37 +263,20 @@ class HabitCheckBox(ui.checkbox):
         # Do refresh the total row
         self.row_refresh()
 
-    async def _mouse_down_event(self, e):
-        logger.info(f"Down event: {self.day}, {e.args.get('type')}")
-        self.hold.clear()
-        self.moving = False
-        try:
-            async with asyncio.timeout(0.2):
-                await self.hold.wait()
-        except asyncio.TimeoutError:
-            # Long press diaglog
-            value = await note_tick(self.habit, self.day)
+    async def _async_long_press(self):
+        # Long press diaglog
+        value = await note_tick(self.habit, self.day)
 
-            if value is not None:
-                self.value = value
-                self._refresh()
+        if value is not None:
+            self.value = value
+            self._refresh()
 
     async def _click_event(self, e):
         self.value = e.sender.value
 
         # Do update completion status
-        await habit_tick(self.habit, self.day, self.value)
-
-        self._refresh()
-
-    async def _mouse_up_event(self, e):
-        logger.info(f"Up event: {self.day}, {e.args.get('type')}")
-        self.hold.set()
-
-    async def _mouse_move_event(self):
-        # logger.info(f"Move event: {self.day}, {e}")
-        self.moving = True
-        self.hold.set()
+        if await habit_tick(self.habit, self.day, self.value):
+            self._refresh()
 
     def _update_style(self, value: bool):
         self.value = value
@@ -288,11 +287,11 @@ class HabitCheckBox(ui.checkbox):
         # Accessibility
         days = (self.today - self.day).days
         if days == 0:
-            self.props('aria-label="Today"')
+            aria_label = "Today"
         elif days == 1:
-            self.props('aria-label="Yesterday"')
+            aria_label = "Yesterday"
         else:
-            self.props(f'aria-label="{days} days ago"')
+            aria_label = f"{days} days ago"
 
         # icons, e.g. sym_o_notes
         checked, unchecked = "sym_o_check", "sym_o_close"
@@ -300,7 +299,11 @@ class HabitCheckBox(ui.checkbox):
             if CStatus.PERIOD_DONE in self.status:
                 unchecked = "done"
 
-        self.props(f'checked-icon="{checked}" unchecked-icon="{unchecked}" keep-color')
+        # Single props update
+        self.props(
+            f'aria-label="{aria_label}" '
+            f'checked-icon="{checked}" unchecked-icon="{unchecked}" keep-color'
+        )
 
 
 class HabitOrderCard(ui.card):
@@ -316,12 +319,8 @@ class HabitOrderCard(ui.card):
         if not habit or habit.status == HabitStatus.ARCHIVED:
             self.classes("opacity-50")
 
-        # Button to delete habit
-        self.btn: ui.button | None = None
-        self.on(
-            "mouseover", lambda: self.btn and self.btn.classes("transition opacity-100")
-        )
-        self.on("mouseout", lambda: self.btn and self.btn.classes(remove="opacity-100"))
+        # Children styled with group-hover:* are revealed by CSS on hover
+        self.classes("group")
 
 
 class HabitNameTagBadge(ui.badge):
@@ -331,6 +330,16 @@ class HabitNameTagBadge(ui.badge):
         self.classes("bg-transparent")
 
 
+@functools.lru_cache(maxsize=64)
+def _decode_habit_name(name: str) -> tuple[str, tuple[str, ...]]:
+    head, sep, rest = name.partition("#")
+    if not sep:
+        return name, ()
+
+    tags = (x.strip() for x in rest.split("#"))
+    return head.strip(), tuple(x for x in tags if x)
+
+
 class HabitNameInput(ui.input):
     def __init__(
         self,
@@ -378,11 +387,8 @@ class HabitNameInput(ui.input):
 
     @staticmethod
     def decode_name(name: str) -> tuple[str, list[str]]:
-        if "#" not in name:
-            return name, []
-
-        tokens = name.split("#")
-        return tokens[0].strip(), [x.strip() for x in tokens[1:]]
+        name, tags = _decode_habit_name(name)
+        return name, list(tags)
 
     @staticmethod
     def encode_name(habit: Habit) -> str:
@@ -484,7 +490,11 @@ class HabitDateInput(ui.date):
         self.today = today
         self.habit = habit
         self.refreshs = refreshs
-        super().__init__(self._tick_days, on_change=self._async_task)
+
+        # Selected days as shown in the picker, diffed against on change
+        tick_days = self._tick_days
+        self._selected = frozenset(tick_days) - {TODAY}
+        super().__init__(tick_days, on_change=self._async_task)
 
         self.props("multiple minimal flat today-btn")
         self.props(f"default-year-month={self.today.strftime(MONTH_MASK)}")
@@ -493,32 +503,33 @@ class HabitDateInput(ui.date):
         self.classes("shadow-none")
 
         # self.bind_value_from(self, "_tick_days")
-        events = [
-            d.strftime(CALENDAR_EVENT_MASK)
-            for d, r in self.habit.ticked_data.items()
-            if r.text
-        ]
+        events = list(self.habit.noted_days_str)
         self.props(f'events="{events}" event-color="teal"')
 
     @property
     def _tick_days(self) -> list[str]:
-        ticked_days = [x.strftime(DAY_MASK) for x in self.habit.ticked_days]
-        return [*ticked_days, TODAY]
+        return [*self.habit.ticked_days_str, TODAY]
 
     async def _async_task(self, e: events.ValueChangeEventArguments):
-        old_values = set(self.habit.ticked_days)
-        new_values = set(strptime(x, DAY_MASK).date() for x in e.value if x != TODAY)
+        old_values = self._selected
+        new_values = frozenset(e.value or ()) - {TODAY}
 
+        # Only the single toggled day needs parsing
         if diff := new_values - old_values:
-            day, value = diff.pop(), True
+            day, value = parse_day(next(iter(diff))), True
         elif diff := old_values - new_values:
-            day, value = diff.pop(), False
+            day, value = parse_day(next(iter(diff))), False
         else:
             return
+        self._selected = new_values
 
         self.props(f"default-year-month={day.strftime(MONTH_MASK)}")
-        await habit_tick(self.habit, day, bool(value))
-        self.value = self._tick_days
+        if not await habit_tick(self.habit, day, bool(value)):
+            return
+
+        tick_days = self._tick_days
+        self._selected = frozenset(tick_days) - {TODAY}
+        self.value = tick_days
 
         if self.refreshs:
             logger.debug("refresh page")
@@ -526,15 +537,15 @@ class HabitDateInput(ui.date):
                 refresh()
 
 
-@dataclass
+@dataclass(frozen=True)
 class CalendarHeatmap:
     """Habit records by weeks"""
 
     today: datetime.date
 
-    headers: list[str]
-    data: list[list[datetime.date]]
-    week_days: list[str]
+    headers: tuple[str, ...]
+    data: tuple[tuple[datetime.date, ...], ...]
+    week_days: tuple[str, ...]
 
     @property
     def first_day(self) -> datetime.date:
@@ -543,12 +554,9 @@ class CalendarHeatmap:
     @classmethod
     def build(
         cls, today: datetime.date, weeks: int, firstweekday: int = calendar.MONDAY
-    ):
-        data = cls.generate_calendar_days(today, weeks, firstweekday)
-        headers = cls.generate_calendar_headers(data[0])
-        week_day_abbr = [calendar.day_abbr[(firstweekday + i) % 7] for i in range(7)]
-
-        return cls(today, headers, data, week_day_abbr)
+    ) -> "CalendarHeatmap":
+        # Immutable, so all heatmaps of the same day share one instance
+        return _build_calendar_heatmap(today, weeks, firstweekday)
 
     @staticmethod
     def generate_calendar_headers(days: list[datetime.date]) -> list[str]:
@@ -580,92 +588,114 @@ class CalendarHeatmap:
         # Find the last day of the week
         lastweekday = (firstweekday - 1) % 7
         days_delta = (lastweekday - today.weekday()) % 7
-        last_date_of_calendar = today + datetime.timedelta(days=days_delta)
+        last_ordinal = today.toordinal() + days_delta
 
+        # Step over ordinals instead of building a timedelta per cell
+        first_ordinal = last_ordinal - WEEK_DAYS * total_weeks + 1
+        fromordinal = datetime.date.fromordinal
         return [
-            [
-                last_date_of_calendar - datetime.timedelta(days=i, weeks=j)
-                for j in reversed(range(total_weeks))
-            ]
-            for i in reversed(range(WEEK_DAYS))
+            [fromordinal(first_ordinal + i + WEEK_DAYS * j) for j in range(total_weeks)]
+            for i in range(WEEK_DAYS)
         ]
 
 
-class CalendarCheckBox(ui.checkbox):
-    def __init__(
-        self,
-        habit: Habit,
-        day: datetime.date,
-        status: list[CStatus],
-        readonly: bool = False,
-        refresh: Callable | None = None,
-    ) -> None:
-        self.habit = habit
-        self.day = day
-        self.status = status
-        self.refresh = refresh
-        super().__init__("", value=self.ticked)
+@functools.lru_cache(maxsize=16)
+def _build_calendar_heatmap(
+    today: datetime.date, weeks: int, firstweekday: int
+) -> CalendarHeatmap:
+    data = CalendarHeatmap.generate_calendar_days(today, weeks, firstweekday)
+    headers = CalendarHeatmap.generate_calendar_headers(data[0])
+    week_day_abbr = [calendar.day_abbr[(firstweekday + i) % 7] for i in range(7)]
 
-        self.classes("inline-block")
-        self.props("dense")
-        unchecked_icon, checked_icon = self._icon_svg()
-        self.props(f'unchecked-icon="{unchecked_icon}"')
-        self.props(f'checked-icon="{checked_icon}"')
+    return CalendarHeatmap(
+        today,
+        tuple(headers),
+        tuple(tuple(x) for x in data),
+        tuple(week_day_abbr),
+    )
 
-        self.on_value_change(self._async_click_task)
-        if readonly:
-            self.on("mousedown.prevent", lambda: True)
-            self.on("touchstart.prevent", lambda: True)
 
-        # Hold on event flag
-        self.props(f'data-long-press-delay="{PRESS_DELAY}"')
-        self.on("long-press", self._async_long_press_task)
+HEATMAP_CELL_SIZE = 20
+HEATMAP_HEADER_HEIGHT = 18
+HEATMAP_WEEKDAY_WIDTH = 22
+HEATMAP_FONT = "Roboto,-apple-system,Helvetica Neue,Helvetica,Arial,sans-serif"
 
-    @property
-    def ticked(self) -> bool:
-        record = self.habit.ticked_data.get(self.day)
-        return bool(record and record.done)
-
-    def _icon_svg(self):
-        unchecked_text_color = checked_text_color = "rgb(255,255,255)"
-        unchecked_color, checked_color = "rgb(54,54,54)", icons.PRIMARY_COLOR
-        if CStatus.PERIOD_DONE in self.status:
-            # Normalization + Linear Interpolation
-            unchecked_color = "rgb(40,87,141)"
-
-        dark = get_user_dark_mode()
-        if dark == False:
-            unchecked_color = "rgb(222,222,222)"
-            unchecked_text_color = "rgb(100,100,100)"
-
-        return (
-            icons.SQUARE.format(
-                color=unchecked_color,
-                text=self.day.day,
-                text_color=unchecked_text_color,
-            ),
-            icons.SQUARE.format(
-                color=checked_color, text=self.day.day, text_color=checked_text_color
-            ),
-        )
 
-    async def _async_click_task(self, e: events.ValueChangeEventArguments):
-        # Update persistent storage
-        await self.habit.tick(self.day, e.value)
-        logger.info(f"Day {self.day} ticked: {e.value}")
+@functools.lru_cache(maxsize=512)
+def heatmap_square(dark: bool, checked: bool, period_done: bool, day: int) -> str:
+    if checked:
+        template = icons.SQUARE_CHECKED
+    elif not dark:
+        template = icons.SQUARE_UNCHECKED_LIGHT
+    elif period_done:
+        template = icons.SQUARE_PERIOD_DONE
+    else:
+        template = icons.SQUARE_UNCHECKED
+    return template.format(text=day)
 
-        if self.refresh:
-            logger.debug("refresh page")
-            self.refresh()
 
-    async def _async_long_press_task(self):
-        # Long press diaglog
-        value = await note_tick(self.habit, self.day)
-        if value is not None:
-            self.value = value
+def heatmap_svg(
+    habit: Habit,
+    calendar: CalendarHeatmap,
+    status_map: Mapping[datetime.date, tuple[CStatus, ...]],
+    dark: bool | None,
+) -> str:
+    # Unknown dark mode falls back to the dark palette
+    dark = dark != False
+
+    size = HEATMAP_CELL_SIZE
+    width = len(calendar.headers) * size + HEATMAP_WEEKDAY_WIDTH
+    height = HEATMAP_HEADER_HEIGHT + WEEK_DAYS * size
+    ticked_set = habit.ticked_set
+
+    buf = io.StringIO()
+    buf.write(
+        f"<svg xmlns='http://www.w3.org/2000/svg' width='{width}' height='{height}' "
+        f"viewBox='0 0 {width} {height}' font-size='9' "
+        f"style='font-family: {HEATMAP_FONT};'>"
+    )
 
-        if self.refresh:
-            self.refresh()
+    # Headers
+    for j, header in enumerate(calendar.headers):
+        if header:
+            buf.write(
+                f"<text x='{j * size + size // 2}' y='{HEATMAP_HEADER_HEIGHT // 2}' "
+                f"text-anchor='middle' dominant-baseline='central' "
+                f"fill='currentColor'>{header}</text>"
+            )
+
+    # Day matrix
+    for i, weekday_days in enumerate(calendar.data):
+        y = HEATMAP_HEADER_HEIGHT + i * size
+        for j, day in enumerate(weekday_days):
+            if day > calendar.today:
+                continue
+
+            checked = day in ticked_set
+            square = heatmap_square(
+                dark,
+                checked,
+                CStatus.PERIOD_DONE in status_map.get(day, []),
+                day.day,
+            )
+            buf.write(
+                icons.HEATMAP_CELL.format(
+                    x=j * size,
+                    y=y,
+                    day=day,
+                    checked="true" if checked else "false",
+                    square=square,
+                )
+            )
+
+        buf.write(
+            f"<text x='{len(weekday_days) * size + 6}' y='{y + size // 2}' "
+            f"dominant-baseline='central' fill='currentColor'>"
+            f"{calendar.week_days[i]}</text>"
+        )
+
+    buf.write("</svg>")
+    return buf.getvalue()
 
 
 @ui.refreshable
@@ -676,97 +706,109 @@ def habit_heat_map(
     refresh: Callable | None = None,
 ):
     today = calendar.today
+    dark = get_user_dark_mode()
 
-    # Habit completions
-    status_map = get_habit_date_completion(habit, calendar.first_day, today)
+    def render() -> str:
+        # Habit completions
+        status_map = get_cached_habit_date_completion(habit, calendar.first_day, today)
+        return heatmap_svg(habit, calendar, status_map, dark)
 
-    with ui.column().classes("gap-0"):
-        # Headers
-        with ui.row(wrap=False).classes("gap-0"):
-            for header in calendar.headers:
-                header_lable = ui.label(header).classes(
-                    "text-gray-600 dark:text-gray-300 text-center"
-                )
-                header_lable.style("width: 20px; line-height: 18px; font-size: 9px;")
-            ui.label().style("width: 22px;")
-
-        # Day matrix
-        for i, weekday_days in enumerate(calendar.data):
-            with ui.row(wrap=False).classes("gap-0"):
-                for day in weekday_days:
-                    if day <= calendar.today:
-                        status = status_map.get(day, [])
-                        CalendarCheckBox(habit, day, status, readonly, refresh=refresh)
-                    else:
-                        ui.label().style("width: 20px; height: 20px;")
-
-                week_day_abbr_label = ui.label(calendar.week_days[i])
-                week_day_abbr_label.classes(
-                    "indent-1.5 text-gray-600 dark:text-gray-300"
-                )
-                week_day_abbr_label.style(
-                    "width: 22px; line-height: 20px; font-size: 9px;"
-                )
+    def update():
+        if refresh:
+            logger.debug("refresh page")
+            refresh()
+        else:
+            heatmap.set_content(render())
+
+    async def click_task(e: events.GenericEventArguments):
+        day = parse_day(e.args)
+        record = habit.record_by(day)
+        value = not (record and record.done)
+
+        # Update persistent storage
+        await habit.tick(day, value)
+        logger.info(f"Day {day} ticked: {value}")
+        update()
+
+    async def long_press_task(e: events.GenericEventArguments):
+        # Long press diaglog
+        day = parse_day(e.args)
+        await note_tick(habit, day)
+        update()
+
+    heatmap = ui.html(render())
+    heatmap.classes("heatmap text-gray-600 dark:text-gray-300 cursor-pointer")
+
+    # One listener for the whole grid, resolving the day from the cell
+    if not readonly:
+        heatmap.on("click", click_task, js_handler=HEATMAP_DAY_EVENT)
+        heatmap.on("keydown", click_task, js_handler=HEATMAP_KEY_EVENT)
+
+    # Hold on event flag
+    heatmap.props(f'data-long-press-delay="{PRESS_DELAY}"')
+    heatmap.on("long-press", long_press_task, js_handler=HEATMAP_LONG_PRESS_EVENT)
 
 
 def grid(columns: int, rows: int | None = 1) -> ui.grid:
     return ui.grid(columns=columns, rows=rows).classes("gap-0 items-center")
 
 
+def _chart_template() -> dict:
+    # A fresh literal per chart, so charts never share nested option dicts
+    return {
+        "yAxis": {
+            "type": "value",
+            "position": "right",
+            "splitLine": {
+                "show": True,
+                "lineStyle": {
+                    "color": "#303030",
+                },
+            },
+        },
+        "grid": {
+            "top": 15,
+            "bottom": 25,
+            "left": 5,
+            "right": 30,
+            "show": False,
+        },
+    }
+
+
+def chart_options(chart_type: str, x_data: list, data: list) -> dict:
+    options = _chart_template()
+    options["xAxis"] = {"data": x_data}
+    options["series"] = [
+        {
+            "type": chart_type,
+            "data": data,
+            "itemStyle": {"color": icons.PRIMARY_COLOR},
+            "animation": False,
+        }
+    ]
+    return options
+
+
 @ui.refreshable
 def habit_history(today: datetime.date, habit: Habit, total_months: int = 13):
     # get lastest 6 months, e.g. Feb
+    buckets = Counter((x.year, x.month) for x in habit.ticked_days)
+
     months, data = [], []
     for i in range(total_months, 0, -1):
         offset_date = today - relativedelta(months=i)
         months.append(offset_date.strftime("%b"))
+        data.append(buckets.get((offset_date.year, offset_date.month), 0))
 
-        count = sum(
-            1
-            for x in habit.ticked_days
-            if x.month == offset_date.month and x.year == offset_date.year
-        )
-        data.append(count)
-
-    echart = ui.echart(
-        {
-            "xAxis": {
-                "data": months,
-            },
-            "yAxis": {
-                "type": "value",
-                "position": "right",
-                "splitLine": {
-                    "show": True,
-                    "lineStyle": {
-                        "color": "#303030",
-                    },
-                },
-            },
-            "series": [
-                {
-                    "type": "line",
-                    "data": data,
-                    "itemStyle": {"color": icons.PRIMARY_COLOR},
-                    "animation": False,
-                }
-            ],
-            "grid": {
-                "top": 15,
-                "bottom": 25,
-                "left": 5,
-                "right": 30,
-                "show": False,
-            },
-        }
-    )
+    echart = ui.echart(chart_options("line", months, data))
     echart.classes("h-40")
 
 
 class HabitTotalBadge(ui.badge):
     def __init__(self, habit: Habit) -> None:
         super().__init__()
-        self.bind_text_from(habit, "ticked_days", backward=lambda x: str(len(x)))
+        self.bind_text_from(habit, "tick_count", backward=str)
 
 
 class IndexBadge(HabitTotalBadge):
@@ -776,10 +818,9 @@ class IndexBadge(HabitTotalBadge):
         self.style("font-size: 80%; font-weight: 500")
 
         # Accessibility
-        ticked_days = habit.ticked_days
         self.props(
             f' tabindex="0" '
-            f'aria-label="total completion: {len(ticked_days)};'
+            f'aria-label="total completion: {habit.tick_count};'
             f'{index_badge_alternative_text(today, habit)}"'
         )
 
@@ -829,83 +870,75 @@ def habit_notes(habit: Habit, limit: int = 10):
                 entry.on("dblclick", lambda _, d=record.day: on_dblclick(habit, d))
 
 
+def find_streaks(dates: list[datetime.date]) -> list[tuple[datetime.date, int]]:
+    # Streaks of the sorted dates, as (first day, length)
+    if not dates:
+        return []
+
+    streaks = []
+    first_day = dates[0]
+    start = prev = first_day.toordinal()
+    for day in dates[1:]:
+        cur = day.toordinal()
+        if cur - prev != 1:
+            streaks.append((first_day, prev - start + 1))
+            first_day, start = day, cur
+        prev = cur
+    streaks.append((first_day, prev - start + 1))
+    return streaks
+
+
 def habit_streak(today: datetime.date, habit: Habit):
-    status = get_habit_date_completion(habit, today.replace(year=today.year - 1), today)
-    dates = sorted(status.keys(), reverse=True)
+    status = get_cached_habit_date_completion(
+        habit, today.replace(year=today.year - 1), today
+    )
+    dates = sorted(status)
     if len(dates) <= 1:
         return
 
-    # find the streaks of the dates
-    months, data = [], []
-    streak_count = 1
-    for i in range(1, len(dates)):
-        if (dates[i] - dates[i - 1]).days == -1:
-            streak_count += 1
-        else:
-            months.insert(0, dates[i - 1])
-            data.insert(0, streak_count)
-            streak_count = 1
-            if len(months) >= 5:
-                break
-    else:
-        months.insert(0, dates[-1])
-        data.insert(0, streak_count)
-
-    # draw the graph
-    months = [x.strftime("%d/%m") for x in months]
+    # draw the graph with the latest 5 streaks
+    streaks = find_streaks(dates)
+    months = [x.strftime("%d/%m") for x, _ in streaks[-5:]]
+    data = [count for _, count in streaks[-5:]]
 
-    echart = ui.echart(
-        {
-            "xAxis": {
-                "data": months,
-            },
-            "yAxis": {
-                "type": "value",
-                "position": "right",
-                "splitLine": {
-                    "show": True,
-                    "lineStyle": {
-                        "color": "#303030",
-                    },
-                },
-            },
-            "series": [
-                {
-                    "type": "bar",
-                    "data": data,
-                    "itemStyle": {"color": icons.PRIMARY_COLOR},
-                    "animation": False,
-                }
-            ],
-            "grid": {
-                "top": 15,
-                "bottom": 25,
-                "left": 5,
-                "right": 30,
-                "show": False,
-            },
-        }
-    )
+    echart = ui.echart(chart_options("bar", months, data))
     echart.classes("h-40")
 
 
+# Selected tags of the current request/event, every handler runs in its own context
+_selected_tags: ContextVar[frozenset[str] | None] = ContextVar(
+    "selected_tags", default=None
+)
+
+
 class TagManager:
     @staticmethod
-    def get_all() -> set[str]:
+    def get_all() -> frozenset[str]:
+        if (tags := _selected_tags.get()) is not None:
+            return tags
+
         try:
-            return set(app.storage.user.get("index_tags_filter", []))
+            tags = frozenset(app.storage.user.get("index_tags_filter", []))
         except Exception as e:
             logger.error(f"Failed to get tags: {e}")
-            return set()
+            return frozenset()
+
+        _selected_tags.set(tags)
+        return tags
+
+    @staticmethod
+    def _save(tags: set[str]) -> None:
+        _selected_tags.set(frozenset(tags))
+        app.storage.user["index_tags_filter"] = list(tags)
 
     @staticmethod
     def add(tag: str) -> None:
         if settings.TAG_SELECTION_MODE == TagSelectionMode.SINGLE:
-            app.storage.user["index_tags_filter"] = [tag]
+            TagManager._save({tag})
         else:
             tags = set(TagManager.get_all())
             tags.add(tag)
-            app.storage.user["index_tags_filter"] = list(tags)
+            TagManager._save(tags)
 
     @staticmethod
     def remove(tag: str) -> None:
@@ -914,16 +947,12 @@ class TagManager:
             logger.warning(f"Tag {tag} not found")
 
         tags.remove(tag)
-        app.storage.user["index_tags_filter"] = list(tags)
+        TagManager._save(tags)
 
 
 def get_all_tags(habits: list[Habit]) -> list[str]:
-    result = []
-    for habit in habits:
-        for tag in habit.tags:
-            if tag not in result:
-                result.append(tag)
-    return result
+    # Dedupe in first-seen order
+    return list(dict.fromkeys(tag for habit in habits for tag in habit.tags))
 
 
 def tag_filter_component(active_habits: list[Habit], refresh: Callable):
@@ -931,72 +960,56 @@ def tag_filter_component(active_habits: list[Habit], refresh: Callable):
     if not all_tags:
         return
 
-    with ui.row().classes("gap-0.5 justify-right w-80 hidden") as row:
+    # Scroll listeners for .tag-filter are registered in the page headers
+    selected = TagManager.get_all()
+    with ui.row().classes("tag-filter gap-0.5 justify-right w-80 hidden"):
         for tag_name in all_tags:
-            TagChip(tag_name, refresh=refresh)
-        TagChip("Others", refresh=refresh)
-
-        row.classes("tag-filter")
-        ui.run_javascript(
-            """
-            const element = document.querySelector(".tag-filter");
-        
-            // scroll event
-            window.addEventListener('wheel', function(event) {
-                if (window.scrollY === 0 && event.deltaY < -30) {
-                    element.classList.remove("hidden");
-                }
-                if (window.scrollY === 0 && event.deltaY > 30) {
-                    element.classList.add("hidden");
-                }
-            }, { passive: true  });
-
-            // touch event
-            let startY;
-            window.addEventListener('touchstart', function(event) {
-                startY = event.touches[0].clientY;
-            }, { passive: true  });
-            window.addEventListener('touchmove', function(event) {
-                let currentY = event.touches[0].clientY;
-                if (window.scrollY === 0 && currentY - startY < -30) {
-                    element.classList.add("hidden");
-                }
-                if (window.scrollY === 0 && currentY - startY > 30) {
-                    element.classList.remove("hidden");
-                }
-            }, { passive: true  });
-            """
-        )
+            TagChip(tag_name, refresh=refresh, selected_tags=selected)
+        TagChip("Others", refresh=refresh, selected_tags=selected)
 
 
 def habits_by_tags(active_habits: list[Habit]) -> dict[str, list[Habit]]:
-    all_tags = get_all_tags(active_habits)
-    if not all_tags:
-        return {"": active_habits}
-
-    all_tags.append("Others")
-
-    habits = OrderedDict()
-    # with tags
+    # Group in a single pass, tags keep their first-seen order
+    habits, others = OrderedDict(), []
+    get = habits.get
     for habit in active_habits:
-        for tag in habit.tags:
-            habits.setdefault(tag, []).append(habit)
-    # without tags
-    habits["Others"] = [h for h in active_habits if not h.tags]
+        tags = habit.tags
+        # without tags
+        if not tags:
+            others.append(habit)
+            continue
+
+        # with tags
+        for tag in tags:
+            group = get(tag)
+            if group is None:
+                habits[tag] = [habit]
+            else:
+                group.append(habit)
+
+    if not habits:
+        return {"": active_habits}
 
+    habits["Others"] = others
     return habits
 
 
 class TagChip(ui.chip):
     def __init__(
-        self, tag_name: str, refresh: Callable | None = None, selectable=True
+        self,
+        tag_name: str,
+        refresh: Callable | None = None,
+        selectable=True,
+        selected_tags: frozenset[str] | None = None,
     ) -> None:
+        if selected_tags is None:
+            selected_tags = TagManager.get_all()
         super().__init__(
             text=tag_name,
             color="oklch(0.27 0 0)",
             text_color="oklch(0.9 0 0)",
             selectable=selectable,
-            selected=tag_name in TagManager.get_all(),
+            selected=tag_name in selected_tags,
         )
 
         # https://tailwindcss.com/docs/colors
@@ -1082,41 +1095,47 @@ def habit_remove(habit: Habit):
     ui.navigate.reload()
 
 
+# Upper bound of target count per period unit
+_MAX_TIMES = MappingProxyType({D: 1, W: 7, M: 31, Y: 366})
+
+
 def habit_edit_dialog(habit: Habit) -> ui.dialog:
     p = habit.period or EVERY_DAY
 
     def try_update_period() -> bool:
-        p_count = period_count.value
-        t_count = target_count.value
+        p_val, t_val = period_count.value, target_count.value
+        p_type: PERIOD_TYPE = period_type.value
 
-        if period_type.value not in PERIOD_TYPES:
+        if p_type not in PERIOD_TYPES_SET:
             ui.notify("Invalid period type", color="negative")
             return False
-        p_type: PERIOD_TYPE = period_type.value
 
-        # Check value is digit
-        if not p_count.isdigit() or not t_count.isdigit():
+        # Check value is integer
+        try:
+            p_count, t_count = int(p_val), int(t_val)
+        except (TypeError, ValueError):
             ui.notify("Invalid interval", color="negative")
             return False
-        p_count, t_count = int(p_count), int(t_count)
         if p_count <= 0 or t_count <= 0:
             ui.notify("Invalid period count", color="negative")
             return False
 
         # Check value is in range
-        max_times = {D: 1, W: 7, M: 31, Y: 366}
-        if t_count > max_times.get(p_type, 1) * p_count:
+        if t_count > _MAX_TIMES.get(p_type, 1) * p_count:
             ui.notify("Invalid interval", color="negative")
             return False
 
-        habit.period = HabitFrequency(p_type, p_count, t_count)
-        logger.info(f"Habit period changed to {habit.period}")
+        # Skip the write on no-op saves
+        new_period = HabitFrequency(p_type, p_count, t_count)
+        if habit.period != new_period:
+            habit.period = new_period
+            logger.info(f"Habit period changed to {new_period}")
         dialog.close()
 
         return True
 
     async def save() -> None:
-        if habit not in habit.habit_list.habits:
+        if habit.id not in habit.habit_list.ids:
             await habit.habit_list.add(habit.name, tags=habit.tags)
 
         try_update_period()
@@ -1170,13 +1189,14 @@ def auth_forgot_password(email_input: ui.input, reset: Callable):
             ui.notify("Email is required", color="negative")
             return
 
-        spinner.classes(remove="hidden")
+        spinner.set_visibility(True)
         await reset(email)
-        spinner.classes("hidden")
+        spinner.set_visibility(False)
 
     forgot_entry = auth_redirect("Forgot password?", "#")
     forgot_entry.on("click", try_forgot_password)
-    spinner = ui.spinner().classes("hidden")
+    spinner = ui.spinner()
+    spinner.visible = False
 
 
 def auth_email(value: str | None = None):
@@ -1207,20 +1227,27 @@ def auth_card(title: str, func: Callable):
 
 def habit_name_menu(
     habit: Habit,
+    target_page: str,
     refresh: Callable | None = None,
 ) -> Element:
-    root_path = get_root_path()
-    target_page = os.path.join(root_path, "habits", str(habit.id))
-
-    edit_dialog = habit_edit_dialog(habit)
-    copy_dialog = habit_edit_dialog(habit.copy())
+    # Dialogs are built on first open, next to the name rather than inside
+    # the auto-closing menu
+    edit_dialog = copy_dialog = None
 
     async def edit_habit():
+        nonlocal edit_dialog
+        if edit_dialog is None:
+            with name.parent_slot:
+                edit_dialog = habit_edit_dialog(habit)
         result = await edit_dialog
         if refresh and result:
             refresh()
 
     async def copy_habit():
+        nonlocal copy_dialog
+        if copy_dialog is None:
+            with name.parent_slot:
+                copy_dialog = habit_edit_dialog(habit.copy())
         result = await copy_dialog
         if refresh and result:
             refresh()
@@ -9,6 +9,15 @@ body.desktop .q-checkbox--dense:not(.disabled):focus .q-checkbox__inner:before,
   transform: scale3d(1.4, 1.4, 1);
 }
 
+/* Heatmap cells are plain SVG groups, mirror the checkbox hover and focus */
+.heatmap [data-day] {
+    outline: none;
+}
+body.desktop .heatmap [data-day]:hover rect, .heatmap [data-day]:focus-visible rect {
+    stroke: currentColor;
+    stroke-width: 1.5;
+}
+
 .q-icon img {
     // transition: opacity 0.3s ease;
 }
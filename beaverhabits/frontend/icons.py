@@ -60,6 +60,17 @@ img:data:image/svg+xml;charset=utf8,\
 </svg>\
 """
 
+# Heatmap cells are rendered as one inline SVG, palettes are formatted upfront
+HEATMAP_CELL = "<g transform='translate({x},{y})' data-day='{day}' role='checkbox' aria-checked='{checked}' aria-label='{day}' tabindex='0'>{square}</g>"
+HEATMAP_SQUARE = """\
+<rect x='1' y='1' width='18' height='18' rx='2.5' fill='{color}'/>\
+<text x='10' y='10' text-anchor='middle' dominant-baseline='central' fill='{text_color}' font-size='8'>{{text}}</text>\
+"""
+SQUARE_CHECKED = HEATMAP_SQUARE.format(color=PRIMARY_COLOR, text_color="rgb(255,255,255)")
+SQUARE_UNCHECKED = HEATMAP_SQUARE.format(color=unchecked_square_color, text_color="rgb(255,255,255)")
+SQUARE_PERIOD_DONE = HEATMAP_SQUARE.format(color="rgb(40,87,141)", text_color="rgb(255,255,255)")
+SQUARE_UNCHECKED_LIGHT = HEATMAP_SQUARE.format(color="rgb(222,222,222)", text_color="rgb(100,100,100)")
+
 HELP = SVG_TEMPLATE.format(height="24", color="rgb(204,204,204)", data="M478-240q21 0 35.5-14.5T528-290q0-21-14.5-35.5T478-340q-21 0-35.5 14.5T428-290q0 21 14.5 35.5T478-240Zm-36-154h74q0-33 7.5-52t42.5-52q26-26 41-49.5t15-56.5q0-56-41-86t-97-30q-57 0-92.5 30T342-618l66 26q5-18 22.5-39t53.5-21q32 0 48 17.5t16 38.5q0 20-12 37.5T506-526q-44 39-54 59t-10 73Zm38 314q-83 0-156-31.5T197-197q-54-54-85.5-127T80-480q0-83 31.5-156T197-763q54-54 127-85.5T480-880q83 0 156 31.5T763-763q54 54 85.5 127T880-480q0 83-31.5 156T763-197q-54 54-127 85.5T480-80Zm0-80q134 0 227-93t93-227q0-134-93-227t-227-93q-134 0-227 93t-93 227q0 134 93 227t227 93Zm0-320Z")
 
 # SVG
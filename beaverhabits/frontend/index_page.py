@@ -17,6 +17,7 @@ from beaverhabits.frontend.components import (
     tag_filter_component,
 )
 from beaverhabits.frontend.layout import layout
+from beaverhabits.storage.meta import get_habit_page_path, get_root_path
 from beaverhabits.storage.storage import (
     Habit,
     HabitList,
@@ -58,8 +59,8 @@ def day_headers(days: list[datetime.date]):
         yield "#"
 
 
-def habit_row(habit: Habit, tag: str, days: list[datetime.date]):
-    name = habit_name_menu(habit, index_page_ui.refresh)
+def habit_row(habit: Habit, target_page: str, days: list[datetime.date]):
+    name = habit_name_menu(habit, target_page, index_page_ui.refresh)
     name.classes(LEFT_CLASSES)
     name.props(f'role="heading" aria-level="2" aria-label="{habit.name}"')
 
@@ -93,15 +94,17 @@ def habit_list_ui(days: list[datetime.date], active_habits: List[Habit]):
 
         # Habit Rows
         groups = habits_by_tags(active_habits)
+        root = get_root_path()
 
-        for tag, habit_list in groups.items():
+        for habit_list in groups.values():
             if not habit_list:
                 continue
 
-            for habit in habit_list:
+            targets = [get_habit_page_path(h, root) for h in habit_list]
+            for habit, target_page in zip(habit_list, targets):
                 with ui.card().classes(COMPAT_CLASSES).classes("theme-card-shadow"):
                     with grid(columns, 1):
-                        habit_row(habit, tag, days)
+                        habit_row(habit, target_page, days)
 
             ui.space()
 
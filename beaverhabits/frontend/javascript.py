@@ -26,6 +26,60 @@ elements.forEach(element => {
 });
 """
 
+# Pull down at the top of the page to reveal the tag filter, push up to hide it
+TAG_FILTER_SCROLL = """\
+function toggleTagFilter(hidden) {
+    const element = document.querySelector(".tag-filter");
+    if (element) element.classList.toggle("hidden", hidden);
+}
+
+// scroll event
+window.addEventListener('wheel', function(event) {
+    if (window.scrollY === 0 && event.deltaY < -30) toggleTagFilter(false);
+    if (window.scrollY === 0 && event.deltaY > 30) toggleTagFilter(true);
+}, { passive: true });
+
+// touch event
+let tagFilterStartY;
+window.addEventListener('touchstart', function(event) {
+    tagFilterStartY = event.touches[0].clientY;
+}, { passive: true });
+window.addEventListener('touchmove', function(event) {
+    let deltaY = event.touches[0].clientY - tagFilterStartY;
+    if (window.scrollY === 0 && deltaY < -30) toggleTagFilter(true);
+    if (window.scrollY === 0 && deltaY > 30) toggleTagFilter(false);
+}, { passive: true });
+"""
+
+# Event delegation for the heatmap grid, emit the day of the clicked cell
+HEATMAP_DAY_EVENT = """\
+(e) => {
+  const cell = e.target.closest('[data-day]');
+  if (cell) emit(cell.dataset.day);
+}
+"""
+
+# Cancelled long press stops long-press-event from firing the trailing click
+HEATMAP_LONG_PRESS_EVENT = """\
+(e) => {
+  const cell = e.target.closest('[data-day]');
+  if (!cell) return;
+  e.preventDefault();
+  emit(cell.dataset.day);
+}
+"""
+
+# Toggle the focused cell with Enter or Space, like a checkbox
+HEATMAP_KEY_EVENT = """\
+(e) => {
+  if (e.key !== 'Enter' && e.key !== ' ') return;
+  const cell = e.target.closest('[data-day]');
+  if (!cell) return;
+  e.preventDefault();
+  emit(cell.dataset.day);
+}
+"""
+
 PADDLE_JS_TEMPLATE = """\
 <script src="https://cdn.paddle.com/paddle/v2/paddle.js"></script>
 <script type="text/javascript">
@@ -59,7 +59,7 @@ def add_ui(habit_list: HabitList):
                 ui.separator().props("w-full size=1.5px")
                 continue
 
-        with components.HabitOrderCard(item) as card:
+        with components.HabitOrderCard(item):
             with ui.row().classes("min-h-10 w-80 items-center"):
                 ui.label(item.name)
 
@@ -67,8 +67,7 @@ def add_ui(habit_list: HabitList):
 
                 if item.status == HabitStatus.ARCHIVED:
                     btn = HabitDeleteButton(item, habit_list, add_ui.refresh)
-                    btn.classes("opacity-0")
-                    card.btn = btn
+                    btn.classes("opacity-0 group-hover:opacity-100 transition")
                 badge = HabitTotalBadge(item)
                 badge.props("color=grey-9")
 
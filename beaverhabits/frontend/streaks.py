@@ -23,8 +23,7 @@ def compat_card():
 
 
 def streaks(today: datetime.date, habit: Habit):
-    ticked_data = {x: True for x in habit.ticked_days}
-    start_date = min(ticked_data.keys()) if ticked_data else today
+    start_date = habit.earliest_ticked_day or today
 
     while today > start_date:
         with compat_card():
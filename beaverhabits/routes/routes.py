@@ -348,6 +348,9 @@ def init_gui_routes(fastapi_app: FastAPI):
     app.on_connect(fetch_user_dark_mode)
     # app.on_connect(views.apply_theme_style)
 
+    # Tag filter on scroll, registered once for all clients
+    ui.add_head_html(f"<script>{javascript.TAG_FILTER_SCROLL}</script>", shared=True)
+
     ui.run_with(
         fastapi_app,
         title=const.PAGE_TITLE,
@@ -1,5 +1,6 @@
 import datetime
 from dataclasses import dataclass, field
+from functools import cached_property
 
 from beaverhabits.logger import logger
 from beaverhabits.storage.storage import (
@@ -15,6 +16,7 @@ from beaverhabits.utils import generate_short_hash
 
 DAY_MASK = "%Y-%m-%d"
 MONTH_MASK = "%Y/%m"
+CALENDAR_EVENT_MASK = "%Y/%m/%d"
 
 
 @dataclass(init=False)
@@ -41,8 +43,13 @@ class DictRecord(CheckedRecord, DictStorage):
 
     @property
     def day(self) -> datetime.date:
-        date = datetime.datetime.strptime(self.data["day"], DAY_MASK)
-        return date.date()
+        # Stored with DAY_MASK, i.e. ISO 8601
+        value = self.data["day"]
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            # Imported records may carry unpadded days, e.g. 2024-5-1
+            return datetime.datetime.strptime(value, DAY_MASK).date()
 
     @property
     def done(self) -> bool:
@@ -62,13 +69,42 @@ class DictRecord(CheckedRecord, DictStorage):
 
 
 class HabitDataCache:
+    # Lazily derived from the records, dropped on every refresh
+    DERIVED = (
+        "ticked_set",
+        "earliest_ticked_day",
+        "ticked_days_str",
+        "noted_days_str",
+    )
+
     def __init__(self, habit: "DictHabit"):
         self.habit = habit
         self.refresh()
 
     def refresh(self):
         self.ticked_days = [r.day for r in self.habit.records if r.done]
+        self.tick_count = len(self.ticked_days)
         self.ticked_data = {r.day: r for r in self.habit.records}
+        self.completions: dict = {}
+        for name in self.DERIVED:
+            self.__dict__.pop(name, None)
+
+    @cached_property
+    def ticked_set(self) -> frozenset[datetime.date]:
+        return frozenset(self.ticked_days)
+
+    @cached_property
+    def earliest_ticked_day(self) -> datetime.date | None:
+        return min(self.ticked_days, default=None)
+
+    @cached_property
+    def ticked_days_str(self) -> tuple[str, ...]:
+        return tuple(x.strftime(DAY_MASK) for x in self.ticked_days)
+
+    @cached_property
+    def noted_days_str(self) -> tuple[str, ...]:
+        noted_days = (d for d, r in self.ticked_data.items() if r.text)
+        return tuple(d.strftime(CALENDAR_EVENT_MASK) for d in noted_days)
 
 
 @dataclass
@@ -174,6 +210,30 @@ class DictHabit(Habit[DictRecord], DictStorage):
 
         return sum(1 for day in self.ticked_days if start <= day <= end)
 
+    @property
+    def ticked_set(self) -> frozenset[datetime.date]:
+        return self.cache.ticked_set
+
+    @property
+    def earliest_ticked_day(self) -> datetime.date | None:
+        return self.cache.earliest_ticked_day
+
+    @property
+    def ticked_days_str(self) -> tuple[str, ...]:
+        return self.cache.ticked_days_str
+
+    @property
+    def noted_days_str(self) -> tuple[str, ...]:
+        return self.cache.noted_days_str
+
+    @property
+    def tick_count(self) -> int:
+        return self.cache.tick_count
+
+    @property
+    def completion_cache(self) -> dict:
+        return self.cache.completions
+
     @property
     def ticked_data(self) -> dict[datetime.date, DictRecord]:
         return self.cache.ticked_data
@@ -245,6 +305,11 @@ class DictHabitList(HabitList[DictHabit], DictStorage):
     def habits(self) -> list[DictHabit]:
         return [DictHabit(d, self) for d in self.data["habits"]]
 
+    @property
+    def ids(self) -> set[str]:
+        # Computed per call, a scan over the raw dicts without building habits
+        return {d["id"] for d in self.data["habits"] if "id" in d}
+
     @property
     def order(self) -> list[str]:
         return self.data.get("order", [])
@@ -14,18 +14,27 @@ def page_path() -> str:
     return context.client.page.path
 
 
-def is_page_demo() -> bool:
-    path = context.client.page.path
+def _is_demo_path(path: str) -> bool:
     return path.startswith(DEMO_ROOT_PATH) or "pricing" in path
 
 
+def is_page_demo() -> bool:
+    return get_root_path() == DEMO_ROOT_PATH
+
+
 def get_root_path() -> str:
-    return DEMO_ROOT_PATH if is_page_demo() else GUI_ROOT_PATH
+    # The page path never changes for a client, resolve it once
+    client = context.client
+    root = getattr(client, "_bh_root_path", None)
+    if root is None:
+        root = DEMO_ROOT_PATH if _is_demo_path(client.page.path) else GUI_ROOT_PATH
+        client._bh_root_path = root
+    return root
 
 
-def get_habit_page_path(habit: Habit) -> str:
-    return f"{get_root_path()}/habits/{habit.id}"
+def get_habit_page_path(habit: Habit, root: str | None = None) -> str:
+    return f"{root or get_root_path()}/habits/{habit.id}"
 
 
-def get_habit_heatmap_path(habit: Habit) -> str:
-    return f"{get_root_path()}/habits/{habit.id}/streak"
+def get_habit_heatmap_path(habit: Habit, root: str | None = None) -> str:
+    return f"{root or get_root_path()}/habits/{habit.id}/streak"
@@ -7,7 +7,7 @@ from typing import List, Literal, Optional, Protocol, Self
 from dataclasses_json import DataClassJsonMixin
 
 from beaverhabits.app.db import User
-from beaverhabits.utils import PERIOD_TYPES, D
+from beaverhabits.utils import PERIOD_TYPES_SET, D
 
 
 class CheckedRecord(Protocol):
@@ -77,7 +77,7 @@ class HabitFrequency:
             raise ValueError(f"Invalid pattern: {value}")
 
         t_c, p_c, p_t = m.groups()[1:]
-        if p_t not in PERIOD_TYPES:
+        if p_t not in PERIOD_TYPES_SET:
             raise ValueError(f"Invalid period type: {p_t}")
         if not p_c.isdigit() or not t_c.isdigit():
             raise ValueError(f"Invalid period count: {p_c} or target count: {t_c}")
@@ -146,6 +146,24 @@ class Habit[R: CheckedRecord](Protocol):
         self, start: datetime.date | None = None, end: datetime.date | None = None
     ) -> int: ...
 
+    @property
+    def ticked_set(self) -> frozenset[datetime.date]: ...
+
+    @property
+    def earliest_ticked_day(self) -> datetime.date | None: ...
+
+    @property
+    def ticked_days_str(self) -> tuple[str, ...]: ...
+
+    @property
+    def noted_days_str(self) -> tuple[str, ...]: ...
+
+    @property
+    def tick_count(self) -> int: ...
+
+    @property
+    def completion_cache(self) -> dict: ...
+
     @property
     def ticked_data(self) -> dict[datetime.date, R]: ...
 
@@ -183,6 +201,10 @@ class HabitList[H: Habit](Protocol):
     @property
     def habits(self) -> List[H]: ...
 
+    # Ids of the stored habits, not necessarily a maintained set
+    @property
+    def ids(self) -> set[str]: ...
+
     @property
     def order(self) -> List[str]: ...
 
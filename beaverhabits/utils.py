@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import functools
 import gc
@@ -6,10 +7,10 @@ import os
 import smtplib
 import time
 import tracemalloc
-from collections import Counter
+from collections import Counter, deque
 from email.mime.text import MIMEText
 from functools import wraps
-from typing import Literal, TypeAlias
+from typing import Hashable, Literal, TypeAlias
 
 import psutil
 import pytz
@@ -28,6 +29,7 @@ TIME_ZONE_KEY = "timezone"
 DARK_MODE_KEY = "dark_mode"
 
 PERIOD_TYPES = D, W, M, Y = "D", "W", "M", "Y"
+PERIOD_TYPES_SET = frozenset(PERIOD_TYPES)
 PERIOD_TYPES_FOR_HUMAN = {D: "Day(s)", W: "Week(s)", M: "Month(s)", Y: "Year(s)"}
 PERIOD_TYPE: TypeAlias = Literal["D", "W", "M", "Y"]
 
@@ -113,25 +115,43 @@ def generate_short_hash(name: str) -> str:
     return h.hexdigest()[:6]
 
 
-def ratelimiter(limit: int, window: int):
-    if window <= 0 or window > 60 * 60:
-        raise ValueError("Window must be between 1 and 3600 seconds.")
-    cache = TTLCache(maxsize=128, ttl=60 * 60)
+class TokenBucket:
+    """
+    Rate limiter enforcing several (limit, window) pairs in a single pass.
 
-    def decorator(func):
+    Calls are keyed by their arguments. Everything runs on the event loop
+    thread, so the timestamp queues need no locking.
+    """
+
+    def __init__(self, limits: list[tuple[int, float]]):
+        for _, window in limits:
+            if window <= 0 or window > 60 * 60:
+                raise ValueError("Window must be between 1 and 3600 seconds.")
+        self.limits = limits
+        self.cache: TTLCache = TTLCache(maxsize=128, ttl=60 * 60)
+
+    def acquire(self, key: str) -> bool:
+        now = time.monotonic()
+        buckets = self.cache.get(key)
+        if buckets is None:
+            buckets = self.cache[key] = [deque() for _ in self.limits]
+
+        # Drop expired timestamps before checking the thresholds
+        for (limit, window), bucket in zip(self.limits, buckets):
+            while bucket and bucket[0] <= now - window:
+                bucket.popleft()
+            if len(bucket) >= limit:
+                return False
+
+        for bucket in buckets:
+            bucket.append(now)
+        return True
+
+    def __call__(self, func):
+        @wraps(func)
         async def wrapper(*args, **kwargs):
-            current_time = time.time()
             key = f"{args}_{kwargs}"
-
-            # Update timestamps
-            if key not in cache:
-                cache[key] = [current_time]
-            else:
-                cache[key].append(current_time)
-            cache[key] = [i for i in cache[key] if i >= current_time - window]
-
-            # Check with threshold
-            if len(cache[key]) > limit:
+            if not self.acquire(key):
                 logger.warning(
                     f"Rate limit exceeded for {func.__name__} with key {key}"
                 )
@@ -144,7 +164,39 @@ def ratelimiter(limit: int, window: int):
 
         return wrapper
 
-    return decorator
+
+def ratelimiter(limit: int, window: int):
+    return TokenBucket([(limit, window)])
+
+
+_debounce_waiters: dict[Hashable, asyncio.Future] = {}
+
+
+def _resolve(future: asyncio.Future, value: bool) -> None:
+    if not future.done():
+        future.set_result(value)
+
+
+async def debounce(key: Hashable, delay: float) -> bool:
+    """
+    Wait until no newer call with the same key arrives within `delay` seconds.
+
+    Only the latest call of a burst returns True, the superseded ones return
+    False immediately, so callers can collapse repeated writes into one.
+    Keys are shared by the whole process, so callers namespace them.
+    """
+    if waiter := _debounce_waiters.get(key):
+        _resolve(waiter, False)
+
+    loop = asyncio.get_running_loop()
+    waiter = _debounce_waiters[key] = loop.create_future()
+    handle = loop.call_later(delay, _resolve, waiter, True)
+    try:
+        return await waiter
+    finally:
+        handle.cancel()
+        if _debounce_waiters.get(key) is waiter:
+            del _debounce_waiters[key]
 
 
 def get_period_fist_day(date: datetime.date, period_type: str) -> datetime.date:
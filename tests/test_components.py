@@ -0,0 +1,98 @@
+import calendar
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from beaverhabits.frontend.components import (
+    CalendarHeatmap,
+    HabitNameInput,
+    find_streaks,
+    habits_by_tags,
+)
+
+
+@pytest.mark.parametrize(
+    "days, expected",
+    [
+        ([], []),
+        ([1], [(1, 1)]),
+        ([1, 2, 3], [(1, 3)]),
+        ([1, 2, 3, 5, 6, 9], [(1, 3), (5, 2), (9, 1)]),
+        ([1, 3, 5], [(1, 1), (3, 1), (5, 1)]),
+    ],
+)
+def test_find_streaks(days, expected):
+    dates = [date(2025, 1, d) for d in days]
+    assert find_streaks(dates) == [(date(2025, 1, d), n) for d, n in expected]
+
+
+def test_find_streaks_across_months():
+    dates = [date(2024, 2, 28), date(2024, 2, 29), date(2024, 3, 1), date(2024, 3, 3)]
+    assert find_streaks(dates) == [(date(2024, 2, 28), 3), (date(2024, 3, 3), 1)]
+
+
+@pytest.mark.parametrize(
+    "today, weeks, firstweekday, first, last",
+    [
+        # Wednesday, weeks end on Sunday
+        (date(2024, 1, 3), 2, calendar.MONDAY, date(2023, 12, 25), date(2024, 1, 7)),
+        # Weeks end on Saturday
+        (date(2024, 1, 3), 2, calendar.SUNDAY, date(2023, 12, 24), date(2024, 1, 6)),
+        # Today is the last day of the week
+        (date(2024, 1, 7), 1, calendar.MONDAY, date(2024, 1, 1), date(2024, 1, 7)),
+        # Across the leap day
+        (date(2024, 3, 1), 1, calendar.MONDAY, date(2024, 2, 26), date(2024, 3, 3)),
+    ],
+)
+def test_generate_calendar_days(today, weeks, firstweekday, first, last):
+    data = CalendarHeatmap.generate_calendar_days(today, weeks, firstweekday)
+    assert len(data) == 7 and all(len(row) == weeks for row in data)
+    assert data[0][0] == first and data[-1][-1] == last
+
+    # Rows are weekdays, columns are weeks
+    for i, row in enumerate(data):
+        for j, day in enumerate(row):
+            assert day == first + timedelta(days=i, weeks=j)
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("Read", ("Read", [])),
+        ("Read #books", ("Read", ["books"])),
+        ("Read #books#daily", ("Read", ["books", "daily"])),
+        ("  Read  # books  # daily ", ("Read", ["books", "daily"])),
+        ("#books", ("", ["books"])),
+        # Empty tags are dropped
+        ("Read #", ("Read", [])),
+        ("Read ## books #", ("Read", ["books"])),
+    ],
+)
+def test_decode_name(name, expected):
+    assert HabitNameInput.decode_name(name) == expected
+
+
+def test_habits_by_tags():
+    a, b, c, d = (
+        SimpleNamespace(name="a", tags=["work"]),
+        SimpleNamespace(name="b", tags=[]),
+        SimpleNamespace(name="c", tags=["home", "work"]),
+        SimpleNamespace(name="d", tags=["home"]),
+    )
+
+    # Tags keep their first-seen order, untagged habits go to "Others"
+    groups = habits_by_tags([a, b, c, d])
+    assert list(groups) == ["work", "home", "Others"]
+    assert groups["work"] == [a, c]
+    assert groups["home"] == [c, d]
+    assert groups["Others"] == [b]
+
+    # "Others" is kept even when empty
+    assert habits_by_tags([a]) == {"work": [a], "Others": []}
+
+
+def test_habits_by_tags_without_tags():
+    habits = [SimpleNamespace(name="a", tags=[]), SimpleNamespace(name="b", tags=[])]
+    assert habits_by_tags(habits) == {"": habits}
+    assert habits_by_tags([]) == {"": []}
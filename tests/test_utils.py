@@ -1,6 +1,11 @@
+import asyncio
+import time
 from datetime import datetime
 
-from beaverhabits.utils import format_date_difference
+import pytest
+from fastapi import HTTPException
+
+from beaverhabits.utils import TokenBucket, debounce, format_date_difference
 
 
 def s2d(date_str):
@@ -26,3 +31,59 @@ def test_date_diff_format():
     assert format_date_difference(s2d(start), s2d("2025-05-27")) == ""
     assert format_date_difference(s2d(start), s2d("2025-05-28")) == "1 days"
     assert format_date_difference(s2d(start), s2d("2025-05-29")) == "2 days"
+
+
+@pytest.mark.asyncio
+async def test_debounce():
+    # Superseded calls return False, the last one of a burst returns True
+    results = await asyncio.gather(*(debounce("burst", 0.01) for _ in range(3)))
+    assert results == [False, False, True]
+
+    # Different keys don't interfere
+    results = await asyncio.gather(
+        debounce(("tick", 1), 0.01), debounce(("note", 1), 0.01)
+    )
+    assert results == [True, True]
+
+    # A zero delay flush supersedes the pending call
+    pending = asyncio.create_task(debounce("flush", 10))
+    await asyncio.sleep(0)
+    assert await debounce("flush", 0) is True
+    assert await pending is False
+
+
+def test_token_bucket_windows():
+    bucket = TokenBucket([(3, 0.5), (2, 0.1)])
+
+    # The short window limits bursts, keys are limited separately
+    assert bucket.acquire("a") and bucket.acquire("a")
+    assert not bucket.acquire("a")
+    assert bucket.acquire("b")
+
+    # Once the short window expires, the long one still counts
+    time.sleep(0.15)
+    assert bucket.acquire("a")
+    assert not bucket.acquire("a")
+
+
+def test_token_bucket_rejected_calls():
+    bucket = TokenBucket([(1, 0.2)])
+    assert bucket.acquire("a")
+
+    # Rejected calls don't take a slot, so they don't extend the window
+    time.sleep(0.1)
+    assert not bucket.acquire("a")
+    time.sleep(0.15)
+    assert bucket.acquire("a")
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_decorator():
+    @TokenBucket([(1, 60)])
+    async def echo(value):
+        return value
+
+    assert await echo(1) == 1
+    assert await echo(2) == 2
+    with pytest.raises(HTTPException):
+        await echo(1)